@@ -27,14 +27,41 @@
 #
 #     2   27/06/2020  Added optional fabric/cable check and duplicate names.
 #
+#     3   15/10/2026  Performance changes for large input files. Spreadsheets are read in read only
+#                     (streaming) mode, or with python-calamine if it is installed.
+#                     File paths are built with pathlib so Windows separators are not assumed.
+#
 
 import os  # Allows for file validation
-from pathlib import Path  # Allows parsing of filename
+from pathlib import Path  # Allows parsing of filename and building file paths
 # import pdb                        # Trace routines - pdb.set_trace()
 from datetime import datetime  # Date/time retrieval modules
 from openpyxl import load_workbook  # Excel workbook functions
+try:
+    from python_calamine import CalamineWorkbook  # Faster Excel reader - optional
+except ImportError:
+    CalamineWorkbook = None  # Not installed so use openpyxl
 import csv  # Allow CSV files to be read
+from contextlib import closing  # Makes sure workbooks are closed
+from collections import Counter  # Used for duplicate checks
+from operator import itemgetter  # Sort keys for the all_fab list
+from itertools import islice  # Pairs adjacent rows without copying the list
+import re  # Regular expressions for WWID checks
+import sys  # Output of validation messages
+
+
+#
+# Compiled patterns used by the validity checks
+#
+_STRICT_WWID_RE = re.compile(r'[0-9a-fA-F]{2}(?::[0-9a-fA-F]{2}){7}\Z')  # Brocade format WWID
+# Bytes to delete so that only the lower case hex characters remain - input is ASCII by then
+_NON_HEX = bytes(c for c in range(128) if chr(c) not in '0123456789abcdef')
 
+#
+# Messages for invalid data found by the validity checks. These are reported together once all
+# the input rows have been read.
+#
+validation_errors = []
 
 #
 # Define functions first -----------------------------------------------------------
@@ -48,23 +75,13 @@ import csv  # Allow CSV files to be read
 
 def strictwwid(wwid):
     """Validity checks WWID for invalid format using strict rules - must be Brocade format"""
+    if _STRICT_WWID_RE.fullmatch(wwid):  # 8 pairs of hex characters with colon separators
+        return wwid  # Looks good so return WWID
     if len(wwid) != 23:  # WWPN must be 23 characters long
-        print("WWID has invalid length " + wwid)
-        return None
-    # Colon separators must be in the correct place
-    if wwid[2:3] != ":" and wwid[5:6] != ":" and wwid[8:9] != ":" and wwid[11:12] != ":" \
-            and wwid[14:15] != ":" and wwid[17:18] != ":" and wwid[20:21] != ":":
-        print(("WWID invalid format - colon not where expected " + wwid))
-        return None
-    # Remove colons from expected locations in wwid string.
-    hexwid = wwid[0:2] + wwid[3:5] + wwid[6:8] + wwid[9:11] + wwid[12:14] + wwid[15:17] + wwid[18:20] + wwid[21:23]
-    # Only hex characters allowed in wwpn after extracting colons
-    for nibble in hexwid:
-        if (nibble < "0" or nibble > "f") or (nibble > "9" and nibble < "a"):
-            print("WWID has invalid hex character " + wwid)
-            return None
-
-    return wwid  # Looks good so return WWID
+        validation_errors.append("WWID has invalid length " + wwid)
+    else:
+        validation_errors.append("WWID invalid format - colon or hex character not where expected " + wwid)
+    return None
 
 
 #
@@ -78,32 +95,21 @@ def strictwwid(wwid):
 def loosewwid(wwid):
     """Validity checks WWID for invalid format using loose rules - any hex values used:"""
 
-    hexstring = ""
-
-    for userchar in wwid:  # Get each character in the input and isolate hex characters
-        userchar = userchar.lower()  # For consistency convert to lower case
-        # Only hex values 0-9 and a-f allowed
-        if (userchar >= "0" and userchar <= "9") or (userchar >= "a" and userchar <= "f"):
-            hexstring = hexstring + userchar  # Form an unformatted string
+    # For consistency convert to lower case then isolate the hex characters 0-9 and a-f.
+    # Non ASCII characters are dropped by the encode so the delete table only covers ASCII.
+    hexstring = wwid.lower().encode("ascii", "ignore").translate(None, _NON_HEX).decode("ascii")
     #
     # Should now have a string of length 16. If we haven't then user input was invalid
     #
 
     if len(hexstring) != 16:
-        print("WWID has invalid length " + wwid)
+        validation_errors.append("WWID has invalid length " + wwid)
         return None
     else:
         #
         # Brocade format 2 chars with colon separator
         #
-        brocadefmt = hexstring[0:2] + ":" \
-                     + hexstring[2:4] + ":" \
-                     + hexstring[4:6] + ":" \
-                     + hexstring[6:8] + ":" \
-                     + hexstring[8:10] + ":" \
-                     + hexstring[10:12] + ":" \
-                     + hexstring[12:14] + ":" \
-                     + hexstring[14:16]
+        brocadefmt = ":".join(hexstring[i:i + 2] for i in range(0, 16, 2))
         return brocadefmt  # Return accepted WWID in Brocade format
 
 
@@ -124,6 +130,92 @@ def alias_format(linelist):
     return ali  # Return alias name
 
 
+#
+# Cell values from either input file type are converted to a stripped string. None values (empty
+# cells from openpyxl) become "" as they cause issues with sort functions later. Whole number floats
+# (numeric cells from calamine) become ints so 1.0 reads as 1. Case is optionally forced to upper
+# ("U") or lower ("L").
+#
+
+
+def norm_cell(cell, case=None):
+    """Returns a cell value as a stripped string, optionally converted to upper or lower case"""
+    if isinstance(cell, float) and cell.is_integer():
+        cell = int(cell)
+    value = "" if cell is None else str(cell).strip()
+    if case == "U":
+        return value.upper()
+    if case == "L":
+        return value.lower()
+    return value
+
+
+#
+# CSV rows are read with the csv module. The first line is skipped as it holds the column headers.
+#
+
+
+def csv_rows(infile):
+    """Yields each row after the header row from the CSV file"""
+    with open(infile, newline="") as f:  # Open input file - csv module handles line endings
+        csvreader = csv.reader(f)
+        next(csvreader, None)  # Ignore first line as column headers from spreadsheet
+        yield from csvreader
+
+
+#
+# Spreadsheet rows are read with python-calamine if it is installed, otherwise with openpyxl.
+# The workbook is closed as soon as the last row has been read - openpyxl read only mode
+# holds the file open until then.
+#
+
+
+def xlsx_rows(infile):
+    """Yields each row after the header row from the spreadsheet and closes the workbook when done"""
+    if CalamineWorkbook is not None:  # python-calamine is installed so use it
+        with closing(CalamineWorkbook.from_path(infile)) as xlworkbook:
+            # Use the first sheet - calamine returns empty cells as ""
+            yield from xlworkbook.get_sheet_by_index(0).to_python()[1:]  # Row 1 assumed to be header
+    else:
+        # Read only mode streams the rows rather than loading the whole workbook into memory
+        with closing(load_workbook(infile, read_only=True, data_only=True, keep_links=False)) as xlworkbook:
+            xlsheet = xlworkbook.worksheets[0]  # Use the first sheet - same as the calamine path
+            yield from xlsheet.iter_rows(min_row=2,  # Min row = 2 - row 1 assumed to be header
+                                         min_col=1,
+                                         max_col=6,
+                                         values_only=True)
+
+
+#
+# Each row read from the input file is checked as it is read. The WWPN is validated using the
+# strict or loose rules and the Initiator/Target and fabric indicators must have allowed values.
+# Returns None if the row is invalid or the row (WWPN in Brocade format) if it is valid
+#
+
+
+def check_row(devrow, strict):
+    """Validity checks a row destined for all_fab and returns it or None if invalid"""
+    if strict == "S":  # Check wwpn has valid format
+        wwpn = strictwwid(devrow[5])
+    else:  # Loose checking
+        wwpn = loosewwid(devrow[5])
+    if wwpn is None:
+        return None
+    devrow[5] = wwpn  # Keep the WWPN in Brocade format
+
+    # Must be Initiator or Target
+    if devrow[4] != "I" and devrow[4] != "T":
+        validation_errors.append("Invalid Initiator/Target value - must be I or T " + wwpn)
+        return None
+
+    # Fabric must be A or B
+    if devrow[3] != "A" and devrow[3] != "B":
+        validation_errors.append("Fabric identifier must be A or B " + wwpn)
+        return None
+
+    return devrow  # Looks good so return the row
+
+
 #
 #
 # End of functions -----------------------------------------------------------------
@@ -153,7 +245,7 @@ while True:
     csvfile = input("CSV or XLSX filename in " + folder + ": ")  # Data filename request
     if csvfile == "":  # Exit if no input
         exit(1)
-    infile = folder + "\\" + csvfile  # Input file is directory + filename
+    infile = Path(folder) / csvfile  # Input file is directory + filename
 
     filetype = Path(csvfile).suffix  # Check we only have CSV or XLSX file
     filetype = filetype.lower()
@@ -164,39 +256,30 @@ while True:
         print("")
         continue
 
-    if os.path.isfile(infile):  # Check file exists
+    if infile.is_file():  # Check file exists
         break
     else:
-        print("Invalid filename or does not exist - " + infile)
+        print("Invalid filename or does not exist - " + str(infile))
         print("")
 
 #
-# Form the strings used to create the output files
+# Form the paths used to create the output files
 #
-afabali_file = folder + "\\" + "Afab_ali.txt"  # Fabic A alias definitions
-bfabali_file = folder + "\\" + "Bfab_ali.txt"  # Fabric B alias definitions
+base = Path(folder)  # Output files go in the working directory
+afabali_file = base / "Afab_ali.txt"  # Fabic A alias definitions
+bfabali_file = base / "Bfab_ali.txt"  # Fabric B alias definitions
 
-afabzon_file = folder + "\\" + "Afab_zon.txt"  # Fabric A zone definitions
-bfabzon_file = folder + "\\" + "Bfab_zon.txt"  # Fabric B zone definitions
+afabzon_file = base / "Afab_zon.txt"  # Fabric A zone definitions
+bfabzon_file = base / "Bfab_zon.txt"  # Fabric B zone definitions
 
-afabcfg_file = folder + "\\" + "Afab_cfg.txt"  # Fabric A configuration definition
-bfabcfg_file = folder + "\\" + "Bfab_cfg.txt"  # Fabric B configuration definition
+afabcfg_file = base / "Afab_cfg.txt"  # Fabric A configuration definition
+bfabcfg_file = base / "Bfab_cfg.txt"  # Fabric B configuration definition
 
 #
 # Delete the files we are about to generate (if present) to ensure that old versions are not used
 #
-if os.path.exists(afabali_file):
-    os.remove(afabali_file)
-if os.path.exists(bfabali_file):
-    os.remove(bfabali_file)
-if os.path.exists(afabzon_file):
-    os.remove(afabzon_file)
-if os.path.exists(bfabzon_file):
-    os.remove(bfabzon_file)
-if os.path.exists(afabcfg_file):
-    os.remove(afabcfg_file)
-if os.path.exists(bfabcfg_file):
-    os.remove(bfabcfg_file)
+for out_file in (afabali_file, bfabali_file, afabzon_file, bfabzon_file, afabcfg_file, bfabcfg_file):
+    out_file.unlink(missing_ok=True)
 
 strict = ""  # Used to flag Strict or Loose validity checking
 
@@ -235,173 +318,81 @@ while cabchk == "":
         cabchk = ""
 
 #
-# In this section we are reading all non blank lines and constructing an internal list
-# of these items - note this all_fab list is a list of lists.
+# In this section we are reading all non blank lines, validity checking them and constructing an
+# internal list of the valid items - note this all_fab list is a list of lists.
 # Remember that subscripts in Python are relative to zero
 #
-header_passed = False  # Flag value to bypass 1st header row
 errors_found = False  # So we don't process output if invalid data found
 all_fab = []  # Create an empty list to contain read data
 wwidct = 0  # To count the number of wwid entries
 
 if filetype == ".csv":
-    with open(infile) as f:  # Open input file
-        for rec in csv.reader(f):  # Read and process all recs in CSV file
-            node = rec[0].strip()
-            primaryif = rec[1].strip()  # Strip removes leading/trailng spaces
-            subif = rec[2].strip()
-            fabric = rec[3].upper()  # Make fabric id consistent
-            fabric = fabric.strip()
-            initgt = rec[4].upper()  # Make sure case is consistent
-            initgt = initgt.strip()
-            wwpn = rec[5].lower()  # Force lower case for hex characters
-            wwpn = wwpn.strip()
-
-            if not header_passed:  # Ignore first line as column headers from spreadsheet
-                header_passed = True
-                continue
-            if len(node) == 0:  # If no node name whole line assumed empty and ignored
-                continue
-            all_fab.append([node, primaryif, subif, fabric, initgt, wwpn])
+    inrows = csv_rows(str(infile))  # Read all recs in CSV file
 else:
-    xlworkbook = load_workbook(infile)  # Load the spreadsheet
-    xlsheets = xlworkbook.active  # Get sheet names in case of multiples
-    xlsheet = xlworkbook.active  # Set the active sheet as the one to work on
-    xlmaxrow = xlsheet.max_row  # Get the number of rows in the sheet
-    # Read and process all recs in spreadsheet active sheet
-    for rec in xlsheet.iter_rows(min_row=2,  # Min row = 2 - row 1 assumed to be header
-                                 max_row=xlmaxrow,
-                                 min_col=1,
-                                 max_col=6,
-                                 values_only=True):
-        if rec[0] is None or rec[0] == "":  # openpyxl returns None for no value in cell
-            continue  # Assume blank line in this case
-        node = rec[0].strip()
-        primaryif = rec[1].strip()  # Strip removes leading/trailng spaces
-        if rec[2] is None:  # Subif is the only column which can have no value
-            subif = ""  # None values cause issues with sort functions later
-        else:
-            subif = rec[2].strip()
-        fabric = rec[3].upper()  # Make fabric id consistent
-        fabric = fabric.strip()
-        initgt = rec[4].upper()  # Make sure case is consistent
-        initgt = initgt.strip()
-        wwpn = rec[5].lower()  # Force lower case for hex characters
-        wwpn = wwpn.strip()
-        all_fab.append([node, primaryif, subif, fabric, initgt, wwpn])
-if filetype == ".xlsx":
-    del xlworkbook  # Finished with workbook
-#
-# The all_fab list contains one entry for each source row but the contents have not
-# been validity checked. This next section reads all_fab and checks those items it can
-#        
-
-for rec in all_fab:
-    node = rec[0]
-    primaryif = rec[1]
-    subif = rec[2]
-    fabric = rec[3]
-    initgt = rec[4]
-    wwpn = rec[5]
-
-    if strict == "S":  # Check wwpn has valid format
-        wwidok = strictwwid(wwpn)
-        if wwidok is None:
-            errors_found = True
-            continue
-    elif strict != "S":  # Loose checking
-        wwidok = loosewwid(wwpn)
-        if wwidok is None:
-            errors_found = True
-            continue
-        else:
-            wwpn = wwidok
+    inrows = xlsx_rows(str(infile))  # Read all recs in spreadsheet
 
-    # Must be Initiator or Target
-    if initgt != "I" and initgt != "T":
-        print("Invalid Initiator/Target value - must be I or T " + wwpn)
-        errors_found = True
+for rec in inrows:  # Process each rec - the header row has already been skipped
+    # Strip removes leading/trailing spaces. Blank cells are returned as "" whatever the source
+    node = norm_cell(rec[0]) if rec else ""  # CSV returns an empty rec for an empty line
+    if node == "":  # If no node name whole line assumed empty and ignored
         continue
-
-    # Fabric must be A or B
-    if fabric != "A" and fabric != "B":
-        print("Fabric identifier must be A or B " + wwpn)
+    primaryif = norm_cell(rec[1])
+    subif = norm_cell(rec[2])  # Subif is the only column which can have no value
+    fabric = norm_cell(rec[3], "U")  # Make fabric id consistent
+    initgt = norm_cell(rec[4], "U")  # Make sure case is consistent
+    wwpn = norm_cell(rec[5], "L")  # Force lower case for hex characters
+
+    devrow = check_row([node, primaryif, subif, fabric, initgt, wwpn], strict)
+    if devrow is None:  # Invalid data so note the error and carry on checking
         errors_found = True
         continue
-    # Add details to all_fab list
-
+    all_fab.append(devrow)  # Add details to all_fab list
     wwidct += 1  # Update the valid record count
 
+if validation_errors:  # Report all the invalid data found in one go
+    sys.stdout.write("\n".join(validation_errors) + "\n")
+
 #
 # Section 2a
-# Sort the all_fab list into wwpn order so we can check for duplicate wwpns
+# Count each wwpn so we can check for duplicate wwpns
 #
-sort_WWPN = lambda swwpn: swwpn[5]  # Sort funcion to return key value wwpn
-all_fab.sort(key=sort_WWPN)  # Sort list on wwpn
-
-# Now process the list checking for duplicate wwpn entries
-last_wwpn = ""  # Last wwpn value
-for devrow in all_fab:  # Process each row in newly sorted list
-    dr_wwpn = devrow[5]  # Extract wwpn from sorted list
-
-    if dr_wwpn != last_wwpn:  # If we already found it then a duplicate exists
-        last_wwpn = dr_wwpn  # Else update the wwpn data
-    else:
+wwpn_counts = Counter(devrow[5] for devrow in all_fab)
+for dr_wwpn, count in wwpn_counts.items():  # Any wwpn seen more than once is a duplicate
+    if count > 1:
         print("Duplicate wwpn found " + dr_wwpn)
         errors_found = True
 #
 # Section 2b
-# Sort the all_fab list on Node,i/f,subif,wwpn to check for cabling inconsistencies.
-# In addition (and since we are in the correct order) check for duplicate names.
-# In order to be consistent cols A,B,C have a length set to 10 characters. The WWPN should have
-# a consistent length.
-# Define the sort key function first.
+# Check for duplicate names by counting each Node,i/f,subif combination.
 #
-sort_cabkeys = lambda cabval: "{:<10}".format(cabval[0]) + \
-                              "{:<10}".format(cabval[1]) + \
-                              "{:<10}".format(cabval[2]) + \
-                              cabval[5]
-all_fab.sort(key=sort_cabkeys)  # Sort the data for fabric/cable/name reporting.
-#
-# Data is now sorted on name columns + WWPN. First check that there are no duplicate names
-#
-
-prv_node = " "  # Set initial previous line details
-prv_iface = " "
-prv_subif = " "
 dupname_error = False
 
-for devrow in all_fab:  # Check current row values against previous row
-    if devrow[0] == prv_node and \
-            devrow[1] == prv_iface and \
-            devrow[2] == prv_subif:
-        print("Duplicate name found: " + devrow[0] +
-              " " + devrow[1] +
-              " " + devrow[2])
+name_counts = Counter((devrow[0], devrow[1], devrow[2]) for devrow in all_fab)
+for dr_name, count in name_counts.items():  # Any name seen more than once is a duplicate
+    if count > 1:
+        print("Duplicate name found: " + " ".join(dr_name))
         print("")
         errors_found = True  # Mark error found
-        dupnam_error = True  # Need to bypass cable check
-    prv_node = devrow[0]
-    prv_iface = devrow[1]
-    prv_subif = devrow[2]
+        dupname_error = True  # Need to bypass cable check
+#
+# Sort the all_fab list on Node,i/f,subif,wwpn to check for cabling inconsistencies.
+# The columns are compared in turn so names of differing lengths sort consistently.
+# This is the only sort - the alias and zone sections below rely on this order.
+#
+all_fab.sort(key=itemgetter(0, 1, 2, 5))  # Sort the data for fabric/cable reporting.
 #
 # Go through the sorted list again (if requested) and check that the fabric indicators alternate
 # Note - if duplicate name check finds errors it causes confusion in the cable check below
 # so don't do this if errors found.
 #
 if cabchk == "Y" and not dupname_error:  # Only if user has elected to do this
-    fabriccmp = " "  # Set initial values
-    last_devrow = ""
-    for devrow in all_fab:  # Process all rows
-        fabric = devrow[3]  # Extract the fabric indicator
-        if fabric == fabriccmp:  # Is it the same as previous list item
+    for last_devrow, devrow in zip(all_fab, islice(all_fab, 1, None)):  # Each row with the one before
+        if devrow[3] == last_devrow[3]:  # Is the fabric indicator the same as previous list item
             print("Possible cable misconfiguration detected")  # Yes - so report it
             print(last_devrow)  # Print this and the previous list item
             print(devrow)
             print("")
             errors_found = True
-        last_devrow = devrow
-        fabriccmp = fabric
 
 #
 # At this point we should either have found a data inconsistency (in which case stop now)
@@ -417,35 +408,24 @@ if errors_found:
     exit(1)
 #
 # Section 3.
-# Sort the all_fab list by node and interface ids. We do this because we need to create
-# an alias and it's just nice to have them in alphabetical order.
-#
-sort_ALIif = lambda salitgt: salitgt[0] + salitgt[1] + salitgt[2]
-all_fab.sort(key=sort_ALIif)  # Sort list on IT + interface info
+# The all_fab list is already sorted by node and interface ids. We need to create an alias
+# and it's just nice to have them in alphabetical order.
 #
-# Open output files for alias create commands
+# Write the alias create commands - one file for each fabric. Each aliCreate line is formatted as
+# per Brocade CLI and generated as the file is written.
 #
-afabali = open(afabali_file, "w")  # These files hold alias commands
-afabali.write("# Alias create commands for fabric A\n")
-bfabali = open(bfabali_file, "w")  # One file for each fabric
-bfabali.write("# Alias create commands for fabric B\n")
-
-aliact = 0  # Counts for number of alias ecords generated
-alibct = 0
-
-for devrow in all_fab:  # For each valid WWID
-    aliname = alias_format(devrow)  # Create alias name from info in list entry
-    # Now format an aliCreate line as per Brocade CLI
-    aliline = 'aliCreate ' + '"' + aliname + '", "' + devrow[5] + '"\n'
-    if devrow[3] == "A":
-        afabali.write(aliline)  # Write to fabric A file
-        aliact += 1  # Increment fab A alias count
-    else:
-        bfabali.write(aliline)  # Write to fabric B file
-        alibct += 1  # Increment fab B alias count
+with open(afabali_file, "w") as afabali:  # These files hold alias commands
+    afabali.write("# Alias create commands for fabric A\n")
+    afabali.writelines('aliCreate "' + alias_format(devrow) + '", "' + devrow[5] + '"\n'
+                       for devrow in all_fab if devrow[3] == "A")
+with open(bfabali_file, "w") as bfabali:
+    bfabali.write("# Alias create commands for fabric B\n")
+    bfabali.writelines('aliCreate "' + alias_format(devrow) + '", "' + devrow[5] + '"\n'
+                       for devrow in all_fab if devrow[3] == "B")
 
-afabali.close()  # Finshed with alias files
-bfabali.close()
+fab_counts = Counter(devrow[3] for devrow in all_fab)  # Counts for number of alias records generated
+aliact = fab_counts["A"]
+alibct = fab_counts["B"]
 
 # Print alias counts
 print("")
@@ -453,13 +433,10 @@ print(str(aliact) + " alias records were written for fabric A")
 print(str(alibct) + " alias records were written for fabric B\n")
 
 #
-# Sort the all_fab list into I/T order followed by interface ids. We do this because we need to produce
-# a zone configuration record where every initiator interface is connected to target devices on the same fabric
-#
-sort_ITif = lambda sinitgt: sinitgt[4] + sinitgt[0] + sinitgt[1] + sinitgt[2]
-all_fab.sort(key=sort_ITif)  # Sort list on Init/Tgt + interface info
-
-# Now split the list so we have a list of initiators and a list of targets.
+# We need to produce a zone configuration record where every initiator interface is connected to
+# target devices on the same fabric.
+# Split the list so we have a list of initiators and a list of targets. As all_fab is sorted on the
+# interface ids each list stays in interface id order.
 # Note validation only allows I or T
 
 INI_list = []  # Create empty Initiator list
@@ -471,6 +448,15 @@ for devrow in all_fab:  # Extract each row and assign to INI or TGT list as appr
     else:
         TGT_list.append(devrow)  # Assume target as we only allow I or T
 
+# Each alias name is only built once and kept alongside its row
+INI_cached = [(devrow, alias_format(devrow)) for devrow in INI_list]
+TGT_cached = [(devrow, alias_format(devrow)) for devrow in TGT_list]
+
+# Partition the targets by fabric so each initiator is only paired with targets in its own fabric
+TGT_by_fab = {"A": [], "B": []}
+for tgtrow, zonali in TGT_cached:
+    TGT_by_fab[tgtrow[3]].append((tgtrow, zonali))
+
 #
 # Section 4.
 # We should now have produced the alias commands and have split the original all_fab list
@@ -483,21 +469,15 @@ for devrow in all_fab:  # Extract each row and assign to INI or TGT list as appr
 # Note that the zones are created with a zoneCreate command but common targets are added to the
 # zone with a zoneAdd command.
 #
-afabzon = open(afabzon_file, "w")  # These files hold zone commands
-afabzon.write("# Zone create commands for fabric A\n")
-
-bfabzon = open(bfabzon_file, "w")
-bfabzon.write("# Zone create commands for fabric B\n")
+afabzon_lines = ["# Zone create commands for fabric A\n"]  # These lists hold zone commands
+bfabzon_lines = ["# Zone create commands for fabric B\n"]
 
-afabcfg = open(afabcfg_file, "w")
-afabcfg.write("# Switch config commands for fabric A\n")
-afabcfg.write("cfgClear\n")
-afabcfg.write("cfgDisable\n")
-
-bfabcfg = open(bfabcfg_file, "w")
-bfabcfg.write("# Switch config commands for fabric B\n")
-bfabcfg.write("cfgClear\n")
-bfabcfg.write("cfgDisable\n")
+afabcfg_lines = ["# Switch config commands for fabric A\n",  # And these the cfg commands
+                 "cfgClear\n",
+                 "cfgDisable\n"]
+bfabcfg_lines = ["# Switch config commands for fabric B\n",
+                 "cfgClear\n",
+                 "cfgDisable\n"]
 
 #
 # Generate a new configuration name
@@ -508,88 +488,84 @@ last_ininode = None  # Remember the last initiator alias name for changes to zon
 last_iniprime = None  # Remember the last primary initiator node name
 last_tgtnode = None  # Remember the last target node name for changes to zone name
 
-cfga_count = 0  # We need to know when we write the first zoneCreate to each fabric
-cfgb_count = 0  # in order to format the correct cfgCreate/cfgAdd commands
+cfga_zones = []  # Zone names created in each fabric - used to generate the
+cfgb_zones = []  # cfgCreate/cfgAdd commands once all zones are known
 #
 # For each initiator create a zone record for each target that is in the same fabric.
 #
-for inirow in INI_list:  # For each initiator record
+for inirow, initali in INI_cached:  # For each initiator record and its alias for zoneCreate command
     inode = inirow[0]  # Extract the node name
     iprime = inirow[1]  # The primary interface identifier
-    initali = alias_format(inirow)  # Need the initiator alias for zoneCreate command
-    for tgtrow in TGT_list:  # For each target record
-
-        if inirow[3] != tgtrow[3]:  # Check that initiator and target are in the same fabric
-            continue  # Ignore if different fabrics
-
-        else:
-            tnode = tgtrow[0]  # Isolate the target node name
-            # Construct the zone name from init node, init if, tgt node
-            zoname = 'zon_' + inode + '_' + iprime + '_' + tnode
-            zonali = alias_format(tgtrow)  # Get the target alias name
-            #
-            # If the initiator node, initiator primary i/f or the target node have changed then we
-            # need to use a zoneCreate command otherwise a zoneAdd
-            #
-            if inode == last_ininode and \
-                    iprime == last_iniprime and \
-                    tnode == last_tgtnode:  # No change = zoneAdd command
-                zonline = 'zoneAdd    "' + zoname + '", "' + zonali + '"\n'
-                zonline2 = None
-            else:  # Tgt node name change = zoneCreate command
-                zonline = 'zoneCreate "' + zoname + '", "' + initali + '"\n'
-                zonline2 = 'zoneAdd    "' + zoname + '", "' + zonali + '"\n'
-            #
-            # In addition add entries to the fabric cfg commands but be aware the first command
-            # per fabric file has to be a cfgCreate - all other additions are cfgAdd commands.
-            # cfg commands are only added to when a zoneCreate command is generated so the condition
-            # is when a zonline2 is written but this is the first zoneCreate for each fabric.
-            #
-            if inirow[3] == "A":  # If fabric A
-                afabzon.write(zonline)  # Write to fabric A file
-                if zonline2 is not None:
-                    afabzon.write(zonline2)
-                    cfga_count += 1
-                    if cfga_count == 1:
-                        afabcfg.write('cfgCreate "' + cfgname + '", "' + zoname + '"\n')
-                    else:
-                        afabcfg.write('cfgAdd    "' + cfgname + '", "' + zoname + '"\n')
-
-            else:  # Else fabric B
-                bfabzon.write(zonline)  # Write to fabric B file
-                if zonline2 is not None:
-                    bfabzon.write(zonline2)
-                    cfgb_count += 1
-                    if cfgb_count == 1:
-                        bfabcfg.write('cfgCreate "' + cfgname + '", "' + zoname + '"\n')
-                    else:
-                        bfabcfg.write('cfgAdd    "' + cfgname + '", "' + zoname + '"\n')
-
-            last_ininode = inode  # Update the historical values used for zone change
-            last_iniprime = iprime
-            last_tgtnode = tnode
-
-afabzon.close()  # Finshed with zone files
-bfabzon.close()
-afabcfg.write("cfgSave")  # Finished with cfg files
-bfabcfg.write("cfgSave")
-afabcfg.close()
-bfabcfg.close()
+    ifab = inirow[3]  # The initiator fabric
+    for tgtrow, zonali in TGT_by_fab[ifab]:  # For each target record (and alias) in the same fabric
+        tnode = tgtrow[0]  # Isolate the target node name
+        # Construct the zone name from init node, init if, tgt node
+        zoname = 'zon_' + inode + '_' + iprime + '_' + tnode
+        #
+        # If the initiator node, initiator primary i/f or the target node have changed then we
+        # need to use a zoneCreate command otherwise a zoneAdd
+        #
+        if inode == last_ininode and \
+                iprime == last_iniprime and \
+                tnode == last_tgtnode:  # No change = zoneAdd command
+            zonline = 'zoneAdd    "' + zoname + '", "' + zonali + '"\n'
+            zonline2 = None
+        else:  # Tgt node name change = zoneCreate command
+            zonline = 'zoneCreate "' + zoname + '", "' + initali + '"\n'
+            zonline2 = 'zoneAdd    "' + zoname + '", "' + zonali + '"\n'
+        #
+        # In addition remember the zone for the fabric cfg commands. Zones are only added to the
+        # cfg when a zoneCreate command is generated so the condition is when a zonline2 is written.
+        #
+        if ifab == "A":  # If fabric A
+            afabzon_lines.append(zonline)  # Add to fabric A commands
+            if zonline2 is not None:
+                afabzon_lines.append(zonline2)
+                cfga_zones.append(zoname)
+
+        else:  # Else fabric B
+            bfabzon_lines.append(zonline)  # Add to fabric B commands
+            if zonline2 is not None:
+                bfabzon_lines.append(zonline2)
+                cfgb_zones.append(zoname)
+
+        last_ininode = inode  # Update the historical values used for zone change
+        last_iniprime = iprime
+        last_tgtnode = tnode
+
+#
+# Add the zones to the fabric cfg commands but be aware the first command per fabric file has
+# to be a cfgCreate - all other additions are cfgAdd commands.
+#
+for cfg_lines, cfg_zones in ((afabcfg_lines, cfga_zones), (bfabcfg_lines, cfgb_zones)):
+    if cfg_zones:
+        cfg_lines.append('cfgCreate "' + cfgname + '", "' + cfg_zones[0] + '"\n')
+        cfg_lines.extend('cfgAdd    "' + cfgname + '", "' + zoname + '"\n' for zoname in cfg_zones[1:])
+    cfg_lines.append("cfgSave")  # Finished with cfg commands
+
+with open(afabzon_file, "w") as afabzon:  # Write the zone files
+    afabzon.write("".join(afabzon_lines))
+with open(bfabzon_file, "w") as bfabzon:
+    bfabzon.write("".join(bfabzon_lines))
+with open(afabcfg_file, "w") as afabcfg:  # And the cfg files
+    afabcfg.write("".join(afabcfg_lines))
+with open(bfabcfg_file, "w") as bfabcfg:
+    bfabcfg.write("".join(bfabcfg_lines))
 #
 # Remind user where output files are located
 #
 print("The following files have been generated:")
 print("")
 print("Fabric A")
-print(afabali_file + " - Alias commands")
-print(afabzon_file + " - Zone commands")
-print(afabcfg_file + " - Configure commands")
+print(str(afabali_file) + " - Alias commands")
+print(str(afabzon_file) + " - Zone commands")
+print(str(afabcfg_file) + " - Configure commands")
 
 print("")
 print("Fabric B")
-print(bfabali_file + " - Alias commands")
-print(bfabzon_file + " - Zone commands")
-print(bfabcfg_file + " - Configure commands")
+print(str(bfabali_file) + " - Alias commands")
+print(str(bfabzon_file) + " - Zone commands")
+print(str(bfabcfg_file) + " - Configure commands")
 
 print("")
 print(str(wwidct) + " records in total were processed")
@@ -16,19 +16,99 @@
 #
 #     2   11/06/2020 - port information block terminator changed to "Device link speed"
 #
+#     3   15/10/2026 - line handling split into handler functions looked up by the line prefix
+#
 # import pdb                            # pdb.set_trace()
 import os                               # Allows for file validation
+from pathlib import Path                # Builds file paths
+import re                               # Matches leading non printing characters
+
+
+#
+# Define functions first -----------------------------------------------------------
+#
+
+#
+# Each handler takes a cleaned nsshow line and the dictionary holding the details found so far.
+# Values are held pre-formatted as CSV fields ready to be joined into an output line.
+#
+
+
+def reset_port(portinfo):
+    """Sets the port details back to their base values ready for the next port information block"""
+    portinfo["portsymb"] = ',""'                # Hint of remote port id (PortSymb)
+    portinfo["nodesymb"] = ',""'                # Hint of remote device type (NodeSymb)
+    portinfo["devwwid"] = ',""'                 # Remote wwid on this port (Fabric Port Name)
+    portinfo["initgt"] = ',""'                  # Initiator or target
+    portinfo["portx"] = ',""'                   # Port number on switch (Port Index)
+
+
+def handle_fabric(inline, portinfo):
+    """Fabric identifier line"""
+    portinfo["fabric"] = ",,," + inline[7:8]
+
+
+def handle_port(inline, portinfo):
+    """First line of each port entry has WWPN"""
+    devwwidlist = inline.split(";")
+    portinfo["devwwid"] = "," + devwwidlist[2]
+
+
+def handle_portsymb(inline, portinfo):
+    """PortSymb: line"""
+    portinfo["portsymb"] = ',"' + inline.split('"')[1] + '"'
 
-nsfile = ""                             # Input file location
-outline = ""                            # Base value for output line
 
-fabric = ''                             # Fabric identifier
-portsymb = ',""'                         # Hint of remote port id (PortSymb)
-nodesymb = ',""'                         # Hint of remote device type (NodeSymb)
-devwwid = ',""'                          # Remote wwid on this port (Fabric Port Name)
-swwwid = ',""'                           # Local switch port wwid (Permanent Port Name)
-initgt = ',""'                           # Initiator or target
-portx = ',""'                            # Port number on switch (Port Index)
+def handle_nodesymb(inline, portinfo):
+    """NodeSymb: line"""
+    portinfo["nodesymb"] = ',"' + inline.split('"')[1] + '"'
+
+
+def handle_devtype(inline, portinfo):
+    """Initiator or Target type"""
+    portinfo["initgt"] = "," + inline[22:23]
+
+
+def handle_portidx(inline, portinfo):
+    """Switch port (zero relative)"""
+    portinfo["portx"] = "," + inline[12:]
+
+
+def handle_linkspeed(inline, portinfo):
+    """There is nothing more for this port so write values"""
+    outline = portinfo["fabric"] + portinfo["initgt"] + portinfo["devwwid"] + "," + \
+        portinfo["nodesymb"] + portinfo["portsymb"] + portinfo["portx"] + "\n"
+    portinfo["out_lines"].append(outline)
+    reset_port(portinfo)
+
+
+#
+# Handlers are keyed on the text before the first colon. The port entry line has no such key
+# so it is looked up on its first two characters.
+#
+HANDLERS = {"Fabric A": handle_fabric,
+            "Fabric B": handle_fabric,
+            "N ": handle_port,
+            "PortSymb": handle_portsymb,
+            "NodeSymb": handle_nodesymb,
+            "Device type": handle_devtype,
+            "Port Index": handle_portidx,
+            "Device link speed": handle_linkspeed}
+
+#
+# End of functions -----------------------------------------------------------------
+#
+
+# Leading characters to be ignored - anything below/above ASCII blank/lower case z. This covers
+# every code point, including the byte order mark and stray bytes decoded as cp1252 (e.g. \x91)
+_LEADING_NONPRINT = re.compile(r'[^ -z]+')
+
+nsfile = ""                             # Input file location
+# Fabric identifier, details of the current port and the output lines - these are collected here
+# and written in one go once the input has been read
+portinfo = {"fabric": '',
+            "out_lines": ["Node,I/f,Subif,Fabric,I/T,WWPN,WWNN,Node Type,Node Id,SWport Index\n"]}
+reset_port(portinfo)
 
 while True:
     folder = input("Enter the working directory: ")         # Directory for CSV file and output files
@@ -44,17 +124,15 @@ while True:
     nsfile = input("NSSHOW filename in " + folder + ": ")     # CSV filename request
     if nsfile == "":                                       # Exit if no input
         exit(1)
-    infile = folder + "\\" + nsfile  # Input file is directory + filename
+    infile = Path(folder) / nsfile  # Input file is directory + filename
 
-    if os.path.isfile(infile):                              # Check file exists
+    if infile.is_file():                                    # Check file exists
         break
     else:
-        print("Invalid filename or does not exist - " + infile)
+        print("Invalid filename or does not exist - " + str(infile))
         print("")
 
-outfile = folder + "\\fabanal.csv"
-outf = open(outfile, "w")
-outf.write("Node,I/f,Subif,Fabric,I/T,WWPN,WWNN,Node Type,Node Id,SWport Index\n")
+outfile = Path(folder) / "fabanal.csv"
 
 
 with open(infile) as inf:
@@ -64,43 +142,17 @@ with open(infile) as inf:
             continue
         # There appears to be a situation where leading characters are non printing.
         # Ignore any leading characters below/above ASCII blank/lower case z
-        while inline[0:1] < " " or inline[0:1] > "z":
-            inline = inline[1:]
+        nonprint = _LEADING_NONPRINT.match(inline)
+        if nonprint:
+            inline = inline[nonprint.end():]
             
         inline = inline.strip()             # Strip leading/training spaces
         inline = " ".join(inline.split())   # And multiple embedded spaces
         
-        if inline[0:9] == "Fabric A:" or inline[0:9] == "Fabric B:":    # Look for Fabric identifier
-            fabric = ",,," + inline[7:8]
-               
-        elif inline[0:2] == "N ":           # First line of each port entry has WWPN
-            devwwidlist = list(inline.split(";"))
-            devwwid = "," + devwwidlist[2]
-
-        elif inline[0:9] == "PortSymb:":    # Look for PortSymb: string
-            portsymb = inline.split('"')
-            portsymb = ',"' + portsymb[1] + '"'
-
-        elif inline[0:9] == "NodeSymb:":     # Look for NodeSymb: string
-            nodesymb = inline.split('"')
-            nodesymb = ',"' + nodesymb[1] + '"'
-
-        elif inline[0:12] == "Device type:":    # Initiator or Target type
-            initgt = "," + inline[22:23]
-
-        elif inline[0:11] == "Port Index:":  # Switch port (zero relative)
-            portx = "," + inline[12:]
-
-        elif inline[0:17] == "Device link speed":         # There is nothing more for this port so write values
-            outline = fabric + initgt + devwwid + "," + nodesymb + portsymb + portx + "\n"
-            outf.write(outline)
-
-            outline = ',""'   # Base value for output line
-            portsymb = ',""'  # Hint of remote port id (PortSymb)
-            nodesymb = ',""'  # Hint of remote device type (NodeSymb)
-            devwwid = ',""'   # Remote wwid on this port (Fabric Port Name)
-            initgt = ',""'    # Initiator or target
-            portx = ',""'     # Port number on switch (Port Index)
-
-outf.close()
-inf.close()
+        # Look up the handler for this line - lines we are not interested in are ignored
+        handler = HANDLERS.get(inline.split(":", 1)[0]) or HANDLERS.get(inline[0:2])
+        if handler is not None:
+            handler(inline, portinfo)
+
+with open(outfile, "w") as outf:
+    outf.writelines(portinfo["out_lines"])
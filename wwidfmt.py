@@ -8,7 +8,12 @@
 #  said string contains 16 hex characters plus whatever formatting characters are supplied. Note that
 #  the input string can be any length but the resulting hex can only be 16 characters.
 #
-#  It is anticipated that the input will be supplied via a paste operation.
+#  It is anticipated that the input will be supplied via a paste operation. If input is piped to the
+#  program instead every line is formatted and the results written once all lines have been read.
+#
+#  By default each Brocade format WWID entered at the prompt replaces the clipboard contents while
+#  piped input sends all the Brocade format WWIDs to the clipboard in one go. Use --copy-all or
+#  --copy-last to choose one behaviour for either case.
 #
 #  The program will return all known formats of the supplied WWID with the Brocade format also being
 #  automatically sent to the clipboard.
@@ -16,56 +21,146 @@
 #   Versions:
 #     1   27/08/2019  Base version
 #
+#     2   15/10/2026  Hex characters isolated with a single translate rather than a character loop.
+#                     Batch processing of piped input added.
+#
 
+import argparse                             # Clipboard options
+import functools                            # Caching of repeated input
+import sys                                  # Output of the formatted WWIDs
+from typing import Callable, Optional, Tuple  # Type annotations
 import pyperclip                            # This is used to send result to the clipboard
 #import pdb                                 # Trace routines - pdb.set_trace()
 
-print("Colon separated strings automatically sent to the clipboard\n")
+_DELETE = bytes(c for c in range(128) if chr(c) not in "0123456789abcdef")  # Non hex ASCII bytes
+_UPPER_HEX = str.maketrans("abcdef", "ABCDEF")  # Upper case for hex only strings
+_HEX_ONLY = str.maketrans("", "", "0123456789abcdef")  # Deletes hex - leaves anything else
+
+
+#
+# Define functions first -----------------------------------------------------------
+#
 
-while True:                                 # Run until use input null
 
-    hexstring = ""                          # Accumulate he characters in this variable
+def extract_hex(userstring: str) -> str:
+    """Returns the hex characters found in the input string in lower case"""
+    userstring = userstring.lower()         # For consistency convert to lower case once
+    # Input which is already 16 hex characters needs no filtering
+    cleaned = userstring.strip()
+    if len(cleaned) == 16 and not cleaned.translate(_HEX_ONLY):
+        return cleaned
+    # Only hex values 0-9 and a-f are kept, everything else is deleted in a single translate.
+    return userstring.encode("ascii", "ignore").translate(None, _DELETE).decode("ascii")
+
+
+def format_brocade(raw: bytes) -> str:
+    """Brocade format 2 chars with colon separator"""
+    return raw.hex(":", 1)
+
+
+def format_vms(raw: bytes) -> str:
+    """VMS format 4 chars with hyphen separator"""
+    return raw.hex("-", 2)
+
+
+@functools.lru_cache(maxsize=256)
+def format_wwid(userstring: str) -> Tuple[str, str, str, str]:
+    """Returns the Brocade, unformatted, upper case hex and VMS formats - ValueError if invalid"""
+    hexstring = extract_hex(userstring)  # Isolate the hex characters in the input
+    #
+    # Should now have a string of length 16. If we haven't then user input was invalid
+    #
+    if len(hexstring) != 16:
+        raise ValueError("Input string does not contain 16 hex characters")
+
+    raw = bytes.fromhex(hexstring)  # Parse once for both separated formats
+    return format_brocade(raw), hexstring, hexstring.translate(_UPPER_HEX), format_vms(raw)
+
+
+def process(userstring: str) -> Tuple[str, Optional[str]]:
+    """Returns the text to display for one input string and its Brocade format (None if invalid)"""
+    try:
+        brocadefmt, hexlower, hexupper, vmsfmt = format_wwid(userstring)
+    except ValueError as err:
+        return str(err) + "\n", None
+    return f"{brocadefmt}\n{hexlower}\n{hexupper}\n{vmsfmt}\n\n", brocadefmt
+
+
+def batch(copy_all: bool, copy: Callable[[str], None]) -> None:
+    """Formats every line piped to standard input and writes all the results in one go"""
+    results = []
+    brocadefmts = []                        # Valid Brocade values for the clipboard
+    for userstring in sys.stdin:
+        if userstring.strip() == "":        # Blank lines are ignored
+            continue
+        output, brocadefmt = process(userstring)
+        if brocadefmt is None:              # Name the offending input as the lines are not echoed
+            output = output.rstrip("\n") + " - " + userstring.strip() + "\n"
+        else:
+            brocadefmts.append(brocadefmt)
+        results.append(output)
+
+    sys.stdout.writelines(results)
+    if brocadefmts:                         # One clipboard update for the whole batch
+        try:
+            copy("\n".join(brocadefmts) if copy_all else brocadefmts[-1])
+        except pyperclip.PyperclipException:  # Piped use is often headless with no clipboard
+            print("No clipboard available - results not copied", file=sys.stderr)
 
-    userstring = input("Enter WWID to format: ")
-    if userstring == "":
-        exit()
 
-    for userchar in userstring:             # Get each character in the input and isolate hex characters
-        userchar = userchar.lower()         # For consistency convert to lower case
-        # Only hex values 0-9 and a-f allowed
-        if (userchar >= "0" and userchar <= "9") or (userchar >= "a" and userchar <= "f"):
-            hexstring = hexstring + userchar    # Form an unformatted string
-#
-# Should now have a string of length 16. If we haven't then user input was invalid
 #
+# End of functions -----------------------------------------------------------------
 #
 
-    if len(hexstring) != 16:
-        print("Input string does not contain 16 hex characters")
+
+def main() -> None:
+    """Prompts for WWIDs until a blank line is entered and prints each in all known formats"""
+    parser = argparse.ArgumentParser(description="Formats WWIDs and sends the Brocade format to the clipboard")
+    copy_group = parser.add_mutually_exclusive_group()
+    copy_group.add_argument("--copy-all", action="store_true",
+                            help="send all Brocade values to the clipboard in one go when input ends "
+                                 "(default for piped input)")
+    copy_group.add_argument("--copy-last", action="store_true",
+                            help="send only the latest Brocade value to the clipboard (default at the prompt)")
+    args = parser.parse_args()
+
+    # Resolve the clipboard mechanism once. pyperclip prefers a native binding where one is available
+    # (ctypes on Windows, PyObjC on macOS) and only falls back to a copy program such as pbcopy/xclip.
+    _copy = pyperclip.determine_clipboard()[0]
+
+    if not sys.stdin.isatty():              # Input is piped in so process it all as a batch
+        batch(not args.copy_last, _copy)
+        return
+    copy_all = args.copy_all
+
+    _input = input                          # Local names are quicker to look up in the loop
+    _write = sys.stdout.write
+
+    if copy_all:
+        print("Colon separated strings sent to the clipboard when a blank line is entered\n")
     else:
-        #
-        # Brocaade format 2 chars with colon separator
-        #
-        brocadefmt = hexstring[0:2] + ":" \
-            + hexstring[2:4] + ":" \
-            + hexstring[4:6] + ":" \
-            + hexstring[6:8] + ":" \
-            + hexstring[8:10] + ":" \
-            + hexstring[10:12] + ":" \
-            + hexstring[12:14] + ":" \
-            + hexstring[14:16]
-        print(brocadefmt)
-        #
-        pyperclip.copy(brocadefmt)          # Send to clipboard
-        #
-        # VMS format 4 chars with hyphen separator
-        #
-        print(hexstring)                    # Print unformatted string
-        print(hexstring.upper())            # And with upper case hex
-        #
-        vmsfmt = hexstring[0:4] + "-" \
-            + hexstring[4:8] + "-" \
-            + hexstring[8:12] + "-" \
-            + hexstring[12:16]
-        print(vmsfmt)
-        print ("")
+        print("Colon separated strings automatically sent to the clipboard\n")
+
+    _last_copied = None                     # Clipboard is only updated when the value changes
+    brocadefmts = []                        # Valid Brocade values when copying all of them
+
+    while True:                             # Run until use input null
+
+        userstring = _input("Enter WWID to format: ")
+        if userstring == "":
+            if brocadefmts:                 # Send everything entered to the clipboard
+                _copy("\n".join(brocadefmts))
+            return
+
+        output, brocadefmt = process(userstring)
+        if brocadefmt is not None:
+            if copy_all:
+                brocadefmts.append(brocadefmt)
+            elif brocadefmt != _last_copied:  # Send to clipboard
+                _copy(brocadefmt)
+                _last_copied = brocadefmt
+        _write(output)                      # Write all the formats in one go
+
+
+if __name__ == "__main__":
+    main()